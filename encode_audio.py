@@ -3,7 +3,7 @@
 Generate base64 encoded audio for testing the API
 """
 
-import base64
+import pybase64
 import sys
 
 
@@ -12,7 +12,7 @@ def encode_audio_file(file_path: str) -> str:
     try:
         with open(file_path, 'rb') as f:
             audio_bytes = f.read()
-            base64_audio = base64.b64encode(audio_bytes).decode('utf-8')
+            base64_audio = pybase64.b64encode(audio_bytes).decode('utf-8')
             return base64_audio
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found")
@@ -1,16 +1,22 @@
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from pydantic import BaseModel, Field
-import base64
+import pybase64
+import xxhash
 import io
-import librosa
 import numpy as np
 from typing import Literal
 import logging
-from scipy import signal
-from scipy.stats import skew, kurtosis
 import warnings
 import os
+import asyncio
+from collections import OrderedDict
+import threading
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 warnings.filterwarnings('ignore')
 
@@ -18,14 +24,117 @@ warnings.filterwarnings('ignore')
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="AI Voice Detection API", version="1.0.0")
-
 # API Key Configuration - can be set via environment variable
 VALID_API_KEY = os.getenv("API_KEY", "sk_test_123456789")
 
 # Supported languages
 SUPPORTED_LANGUAGES = ["Tamil", "English", "Hindi", "Malayalam", "Telugu"]
 
+# Largest accepted base64 payload (~15 MB of audio); larger requests get a
+# 413 before the body is buffered, parsed or decoded
+MAX_BASE64_LENGTH = int(os.getenv("MAX_BASE64_LENGTH", 20_000_000))
+
+# Largest number of clips accepted by the batch endpoint
+MAX_BATCH_ITEMS = int(os.getenv("MAX_BATCH_ITEMS", 32))
+
+# Analysis window - voice features are band-limited well below 8 kHz, so
+# audio is resampled to 16 kHz and only the first 15 seconds are analysed
+TARGET_SAMPLE_RATE = 16000
+MAX_AUDIO_SECONDS = 15
+
+
+def _preload_audio_stack():
+    """Import the audio stack and warm up its JIT code in each worker process"""
+    import librosa  # noqa: F401
+    import soundfile  # noqa: F401
+    import feature_kernels  # noqa: F401
+    
+    # Run the pipeline once on a short tone so numba compiles (or loads from
+    # its cache) every kernel specialisation before the first real request
+    t = np.arange(TARGET_SAMPLE_RATE, dtype=np.float32) / TARGET_SAMPLE_RATE
+    extract_audio_features(0.5 * np.sin(2 * np.pi * 220 * t), TARGET_SAMPLE_RATE)
+
+
+# HTTP serving - number of uvicorn worker processes (uvicorn's own
+# WEB_CONCURRENCY convention) and the in-flight request cap per worker
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 2))
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 64))
+
+# Decoding and feature extraction are CPU-bound, so they run in a process
+# pool to keep the event loop free and use every core. librosa, scipy,
+# soundfile and numba are only imported by the workers, keeping the web
+# process light (workers are started and warmed up at application startup).
+# Every uvicorn worker has its own pool, so the cores are split between them
+FEATURE_WORKERS = int(os.getenv(
+    "FEATURE_WORKERS", max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+))
+
+
+def _new_feature_executor() -> ProcessPoolExecutor:
+    """Create a worker pool whose workers preload the audio stack"""
+    return ProcessPoolExecutor(
+        max_workers=FEATURE_WORKERS,
+        initializer=_preload_audio_stack
+    )
+
+
+# The pool is replaced when a worker dies (e.g. OOM-killed), which leaves a
+# ProcessPoolExecutor permanently broken; the lock makes sure concurrent
+# requests that see the same failure only replace it once
+feature_executor: ProcessPoolExecutor | None = None
+feature_executor_lock = threading.Lock()
+
+
+def get_feature_executor() -> ProcessPoolExecutor:
+    """Return the worker pool, creating it on first use"""
+    global feature_executor
+    with feature_executor_lock:
+        if feature_executor is None:
+            feature_executor = _new_feature_executor()
+        return feature_executor
+
+
+def replace_broken_executor(broken: ProcessPoolExecutor):
+    """Swap a broken worker pool for a fresh one unless that already happened"""
+    global feature_executor
+    with feature_executor_lock:
+        if feature_executor is broken:
+            logger.warning("Feature worker pool is broken, starting a new one")
+            feature_executor = _new_feature_executor()
+    broken.shutdown(wait=False)
+
+
+def shutdown_feature_executor():
+    """Stop the worker pool; a later get_feature_executor() starts a new one"""
+    global feature_executor
+    with feature_executor_lock:
+        executor, feature_executor = feature_executor, None
+    if executor is not None:
+        executor.shutdown()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and warm up the feature worker pool, and shut it down on exit"""
+    # One task per worker: under spawn/forkserver the pool only starts as many
+    # workers as it has pending tasks, so a single task would warm just one
+    executor = get_feature_executor()
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        *(loop.run_in_executor(executor, os.getpid) for _ in range(FEATURE_WORKERS))
+    )
+    yield
+    shutdown_feature_executor()
+
+
+app = FastAPI(title="AI Voice Detection API", version="1.0.0", lifespan=lifespan)
+
+
+# LRU cache of extracted features keyed by a hash of the decoded audio, so
+# repeated payloads (health probes, retries, benchmarks) skip the analysis
+FEATURE_CACHE_SIZE = int(os.getenv("FEATURE_CACHE_SIZE", 128))
+feature_cache: OrderedDict[bytes, dict] = OrderedDict()
+
 
 class VoiceRequest(BaseModel):
     language: Literal["Tamil", "English", "Hindi", "Malayalam", "Telugu"]
@@ -46,6 +155,69 @@ class ErrorResponse(BaseModel):
     message: str
 
 
+class BatchRequest(BaseModel):
+    items: list[VoiceRequest]
+
+
+class BatchResponse(BaseModel):
+    status: str
+    results: list[VoiceResponse | ErrorResponse]
+
+
+class AudioLoadError(Exception):
+    """Raised by worker processes when the uploaded audio cannot be used"""
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Reject request bodies larger than max_body_size with a 413
+
+    Bodies that declare a Content-Length are rejected before they are read.
+    All others (e.g. chunked uploads) are counted as they arrive and cut off
+    once they pass the limit, so an oversize body is never buffered in full
+    """
+    
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse(
+                status_code=413,
+                content={
+                    "status": "error",
+                    "message": "Payload too large"
+                }
+            )
+            await response(scope, receive, send)
+            return
+        
+        received = 0
+        
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # FastAPI re-raises HTTPException from body parsing, so
+                    # this ends up in http_exception_handler as a 413
+                    raise HTTPException(status_code=413, detail="Payload too large")
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
+# Allow some room for the JSON envelope around the base64 string
+app.add_middleware(RequestSizeLimitMiddleware, max_body_size=MAX_BASE64_LENGTH + 1024)
+
+
 def verify_api_key(x_api_key: str = Header(None)):
     """Verify the API key from request headers"""
     if x_api_key is None:
@@ -59,57 +231,64 @@ def extract_audio_features(audio_data: np.ndarray, sr: int) -> dict:
     """
     Extract comprehensive audio features for AI detection
     """
+    import librosa
+    from feature_kernels import summary_stats, signal_moments, zero_crossing_rate, delta_features
+    
     features = {}
     
+    # Work in float32 throughout to halve memory traffic
+    audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
+    
     try:
+        # Compute the STFT once and share it across all spectral features
+        # instead of letting every librosa call redo its own transform
+        stft = librosa.stft(audio_data)
+        S_mag = np.abs(stft)
+        mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=S_mag ** 2, sr=sr))
+        
         # Basic spectral features
-        spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=sr)[0]
-        spectral_rolloff = librosa.feature.spectral_rolloff(y=audio_data, sr=sr)[0]
-        spectral_bandwidth = librosa.feature.spectral_bandwidth(y=audio_data, sr=sr)[0]
-        spectral_flatness = librosa.feature.spectral_flatness(y=audio_data)[0]
+        # (a float32 frequency grid stops librosa upcasting S to float64)
+        fft_freqs = librosa.fft_frequencies(sr=sr).astype(np.float32)
+        spectral_centroids = librosa.feature.spectral_centroid(S=S_mag, sr=sr, freq=fft_freqs)[0]
+        spectral_flatness = librosa.feature.spectral_flatness(S=S_mag)[0]
         
-        features['spectral_centroid_mean'] = np.mean(spectral_centroids)
-        features['spectral_centroid_std'] = np.std(spectral_centroids)
-        features['spectral_centroid_var'] = np.var(spectral_centroids)
-        features['spectral_rolloff_mean'] = np.mean(spectral_rolloff)
-        features['spectral_rolloff_std'] = np.std(spectral_rolloff)
-        features['spectral_bandwidth_mean'] = np.mean(spectral_bandwidth)
-        features['spectral_bandwidth_std'] = np.std(spectral_bandwidth)
+        (features['spectral_centroid_mean'], features['spectral_centroid_std'],
+         features['spectral_centroid_var'], _, _) = summary_stats(spectral_centroids)
         features['spectral_flatness_mean'] = np.mean(spectral_flatness)
         features['spectral_flatness_std'] = np.std(spectral_flatness)
         
         # Zero crossing rate (voice naturalness indicator)
-        zcr = librosa.feature.zero_crossing_rate(audio_data)[0]
-        features['zcr_mean'] = np.mean(zcr)
-        features['zcr_std'] = np.std(zcr)
-        features['zcr_var'] = np.var(zcr)
+        zcr = zero_crossing_rate(audio_data)
+        features['zcr_mean'], features['zcr_std'], features['zcr_var'], _, _ = summary_stats(zcr)
         
         # MFCC features (crucial for voice characteristic analysis)
-        mfccs = librosa.feature.mfcc(y=audio_data, sr=sr, n_mfcc=20)
+        mfccs = librosa.feature.mfcc(S=mel_db, sr=sr, n_mfcc=20)
+        mfcc_means = mfccs.mean(axis=1)
+        mfcc_stds = mfccs.std(axis=1)
+        mfcc_vars = mfccs.var(axis=1)
         for i in range(20):
-            features[f'mfcc_{i}_mean'] = np.mean(mfccs[i])
-            features[f'mfcc_{i}_std'] = np.std(mfccs[i])
-            features[f'mfcc_{i}_var'] = np.var(mfccs[i])
+            features[f'mfcc_{i}_mean'] = mfcc_means[i]
+            features[f'mfcc_{i}_std'] = mfcc_stds[i]
+            features[f'mfcc_{i}_var'] = mfcc_vars[i]
         
         # Delta MFCCs (temporal changes)
-        mfcc_delta = librosa.feature.delta(mfccs)
+        mfcc_delta = delta_features(mfccs)
         features['mfcc_delta_mean'] = np.mean(np.abs(mfcc_delta))
         features['mfcc_delta_std'] = np.std(mfcc_delta)
         
         # Pitch analysis
-        pitches, magnitudes = librosa.piptrack(y=audio_data, sr=sr)
-        pitch_values = []
-        for t in range(pitches.shape[1]):
-            index = magnitudes[:, t].argmax()
-            pitch = pitches[index, t]
-            if pitch > 0:
-                pitch_values.append(pitch)
+        pitches, magnitudes = librosa.piptrack(S=S_mag, sr=sr)
+        # Strongest bin per frame, picked for all frames at once
+        best_bins = magnitudes.argmax(axis=0)
+        pitch_per_frame = pitches[best_bins, np.arange(pitches.shape[1])]
+        pitch_values = pitch_per_frame[pitch_per_frame > 0]
         
         if len(pitch_values) > 0:
-            features['pitch_mean'] = np.mean(pitch_values)
-            features['pitch_std'] = np.std(pitch_values)
-            features['pitch_var'] = np.var(pitch_values)
-            features['pitch_range'] = np.max(pitch_values) - np.min(pitch_values)
+            pitch_mean, pitch_std, pitch_var, pitch_min, pitch_max = summary_stats(pitch_values)
+            features['pitch_mean'] = pitch_mean
+            features['pitch_std'] = pitch_std
+            features['pitch_var'] = pitch_var
+            features['pitch_range'] = pitch_max - pitch_min
             features['pitch_variability'] = features['pitch_std'] / (features['pitch_mean'] + 1e-6)
             features['pitch_coefficient_of_variation'] = (features['pitch_std'] / features['pitch_mean']) if features['pitch_mean'] > 0 else 0
         else:
@@ -120,15 +299,20 @@ def extract_audio_features(audio_data: np.ndarray, sr: int) -> dict:
             features['pitch_variability'] = 0
             features['pitch_coefficient_of_variation'] = 0
         
-        # Energy and amplitude features
+        # Energy and amplitude features (time-domain RMS; the STFT-based
+        # estimate is windowed and would shift the classifier thresholds)
         rms = librosa.feature.rms(y=audio_data)[0]
-        features['rms_mean'] = np.mean(rms)
-        features['rms_std'] = np.std(rms)
-        features['rms_var'] = np.var(rms)
-        features['rms_range'] = np.max(rms) - np.min(rms)
+        rms_mean, rms_std, rms_var, rms_min, rms_max = summary_stats(rms)
+        features['rms_mean'] = rms_mean
+        features['rms_std'] = rms_std
+        features['rms_var'] = rms_var
+        features['rms_range'] = rms_max - rms_min
         
-        # Harmonic and percussive components
-        harmonic, percussive = librosa.effects.hpss(audio_data)
+        # Harmonic and percussive components, separated on the shared STFT
+        # (same as librosa.effects.hpss without its second forward transform)
+        stft_harmonic, stft_percussive = librosa.decompose.hpss(stft)
+        harmonic = librosa.istft(stft_harmonic, length=len(audio_data))
+        percussive = librosa.istft(stft_percussive, length=len(audio_data))
         features['harmonic_mean'] = np.mean(np.abs(harmonic))
         features['percussive_mean'] = np.mean(np.abs(percussive))
         features['harmonic_ratio'] = features['harmonic_mean'] / (features['percussive_mean'] + 1e-6)
@@ -136,26 +320,16 @@ def extract_audio_features(audio_data: np.ndarray, sr: int) -> dict:
         features['percussive_std'] = np.std(percussive)
         
         # Spectral contrast
-        contrast = librosa.feature.spectral_contrast(y=audio_data, sr=sr)
-        features['spectral_contrast_mean'] = np.mean(contrast)
-        features['spectral_contrast_std'] = np.std(contrast)
-        features['spectral_contrast_var'] = np.var(contrast)
-        
-        # Chroma features
-        chroma = librosa.feature.chroma_stft(y=audio_data, sr=sr)
-        features['chroma_mean'] = np.mean(chroma)
-        features['chroma_std'] = np.std(chroma)
-        
-        # Tempo and rhythm
-        onset_env = librosa.onset.onset_strength(y=audio_data, sr=sr)
-        tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr)
-        features['tempo'] = tempo[0] if len(tempo) > 0 else 0
+        contrast = librosa.feature.spectral_contrast(S=S_mag, sr=sr)
+        (features['spectral_contrast_mean'], features['spectral_contrast_std'],
+         features['spectral_contrast_var'], _, _) = summary_stats(contrast.ravel())
         
         # Statistical measures of the raw signal
-        features['signal_skewness'] = skew(audio_data)
-        features['signal_kurtosis'] = kurtosis(audio_data)
-        features['signal_std'] = np.std(audio_data)
-        features['signal_var'] = np.var(audio_data)
+        _, signal_std, signal_var, signal_skewness, signal_kurtosis = signal_moments(audio_data)
+        features['signal_skewness'] = signal_skewness
+        features['signal_kurtosis'] = signal_kurtosis
+        features['signal_std'] = signal_std
+        features['signal_var'] = signal_var
         
         # Jitter and shimmer approximations
         if len(pitch_values) > 1:
@@ -177,132 +351,118 @@ def extract_audio_features(audio_data: np.ndarray, sr: int) -> dict:
     return features
 
 
-def detect_ai_voice(features: dict, language: str) -> tuple[str, float, str]:
-    """
-    Detect if voice is AI-generated based on extracted features
-    
-    IMPROVED DETECTION: More sensitive to AI characteristics
-    
-    AI-generated voices typically have:
-    - Extremely consistent pitch (very low variability)
-    - Very uniform spectral characteristics
-    - Less natural breath sounds and micropauses
-    - More regular temporal patterns
-    - Smoother transitions (low jitter/shimmer)
-    - Lower MFCC variance in specific coefficients
-    - More consistent energy levels
-    """
-    
-    ai_score = 0.0
-    indicators = []
-    
+# Classification rules: (feature, comparison, threshold, score, indicator).
+# Consecutive rules on the same feature are tiers, listed strictest first,
+# of which only the first match scores. Indicators keep this order.
+AI_VOICE_RULES = [
     # CRITICAL INDICATOR 1: Pitch consistency (AI is TOO perfect)
     # Human voices naturally vary, AI is unnaturally stable
-    if features['pitch_variability'] < 0.10:
-        ai_score += 0.35
-        indicators.append("extremely consistent pitch")
-    elif features['pitch_variability'] < 0.20:
-        ai_score += 0.25
-        indicators.append("highly consistent pitch")
-    elif features['pitch_variability'] < 0.30:
-        ai_score += 0.15
-        indicators.append("consistent pitch patterns")
-    
+    ('pitch_variability', '<', 0.10, 0.35, "extremely consistent pitch"),
+    ('pitch_variability', '<', 0.20, 0.25, "highly consistent pitch"),
+    ('pitch_variability', '<', 0.30, 0.15, "consistent pitch patterns"),
     # CRITICAL INDICATOR 2: Low jitter (pitch stability)
     # AI voices have very low jitter compared to human
-    if features.get('jitter', 0) < 0.005:
-        ai_score += 0.25
-        indicators.append("minimal pitch jitter")
-    elif features.get('jitter', 0) < 0.01:
-        ai_score += 0.15
-        indicators.append("low pitch variation")
-    
+    ('jitter', '<', 0.005, 0.25, "minimal pitch jitter"),
+    ('jitter', '<', 0.01, 0.15, "low pitch variation"),
     # CRITICAL INDICATOR 3: Low shimmer (amplitude stability)
     # AI voices maintain very consistent amplitude
-    if features.get('shimmer', 0) < 0.02:
-        ai_score += 0.20
-        indicators.append("minimal amplitude shimmer")
-    elif features.get('shimmer', 0) < 0.05:
-        ai_score += 0.10
-    
+    ('shimmer', '<', 0.02, 0.20, "minimal amplitude shimmer"),
+    ('shimmer', '<', 0.05, 0.10, None),
     # INDICATOR 4: Spectral consistency
     # AI has less variation in spectral characteristics
-    if features['spectral_centroid_std'] < 400:
-        ai_score += 0.20
-        indicators.append("uniform spectral characteristics")
-    elif features['spectral_centroid_std'] < 600:
-        ai_score += 0.10
-    
+    ('spectral_centroid_std', '<', 400, 0.20, "uniform spectral characteristics"),
+    ('spectral_centroid_std', '<', 600, 0.10, None),
     # INDICATOR 5: Spectral flatness (tonality)
     # AI voices often have different spectral flatness
-    if features['spectral_flatness_mean'] > 0.5:
-        ai_score += 0.15
-        indicators.append("unusual spectral flatness")
-    
+    ('spectral_flatness_mean', '>', 0.5, 0.15, "unusual spectral flatness"),
     # INDICATOR 6: Zero crossing rate consistency
     # AI tends to have very regular ZCR
-    if features['zcr_std'] < 0.015:
-        ai_score += 0.20
-        indicators.append("regular speech patterns")
-    elif features['zcr_std'] < 0.025:
-        ai_score += 0.10
-    
+    ('zcr_std', '<', 0.015, 0.20, "regular speech patterns"),
+    ('zcr_std', '<', 0.025, 0.10, None),
     # INDICATOR 7: MFCC variance analysis
     # AI tends to have lower variance in certain coefficients
-    low_variance_mfcc_count = 0
-    for i in range(3, 15):  # Check critical MFCCs
-        if features.get(f'mfcc_{i}_std', 10.0) < 3.0:
-            low_variance_mfcc_count += 1
-    
-    if low_variance_mfcc_count >= 8:
-        ai_score += 0.25
-        indicators.append("synthetic vocal tract characteristics")
-    elif low_variance_mfcc_count >= 6:
-        ai_score += 0.15
-    elif low_variance_mfcc_count >= 4:
-        ai_score += 0.08
-    
+    ('low_variance_mfcc_count', '>=', 8, 0.25, "synthetic vocal tract characteristics"),
+    ('low_variance_mfcc_count', '>=', 6, 0.15, None),
+    ('low_variance_mfcc_count', '>=', 4, 0.08, None),
     # INDICATOR 8: Energy consistency
     # AI often has very consistent energy
-    if features['rms_std'] < 0.008:
-        ai_score += 0.20
-        indicators.append("unnaturally consistent volume")
-    elif features['rms_std'] < 0.015:
-        ai_score += 0.12
-    
+    ('rms_std', '<', 0.008, 0.20, "unnaturally consistent volume"),
+    ('rms_std', '<', 0.015, 0.12, None),
     # INDICATOR 9: Harmonic ratio
     # AI often has higher or more consistent harmonic content
-    if features['harmonic_ratio'] > 3.0:
-        ai_score += 0.15
-        indicators.append("artificial harmonic structure")
-    elif features['harmonic_ratio'] > 2.0:
-        ai_score += 0.08
-    
+    ('harmonic_ratio', '>', 3.0, 0.15, "artificial harmonic structure"),
+    ('harmonic_ratio', '>', 2.0, 0.08, None),
     # INDICATOR 10: Spectral contrast
     # Lower contrast can indicate AI
-    if features['spectral_contrast_std'] < 1.5:
-        ai_score += 0.15
-        indicators.append("reduced spectral dynamics")
-    elif features['spectral_contrast_std'] < 2.5:
-        ai_score += 0.08
-    
+    ('spectral_contrast_std', '<', 1.5, 0.15, "reduced spectral dynamics"),
+    ('spectral_contrast_std', '<', 2.5, 0.08, None),
     # INDICATOR 11: Signal statistical properties
     # AI often has more Gaussian-like distribution
-    if abs(features['signal_kurtosis']) < 1.5:
-        ai_score += 0.12
-        indicators.append("gaussian-like signal distribution")
-    
+    ('abs_signal_kurtosis', '<', 1.5, 0.12, "gaussian-like signal distribution"),
     # INDICATOR 12: MFCC delta (temporal changes)
     # AI has smoother transitions
-    if features.get('mfcc_delta_std', 10) < 5.0:
-        ai_score += 0.10
-        indicators.append("smooth temporal transitions")
-    
+    ('mfcc_delta_std', '<', 5.0, 0.10, "smooth temporal transitions"),
     # INDICATOR 13: Pitch coefficient of variation
     # Very low CV indicates AI
-    if features['pitch_coefficient_of_variation'] < 0.08:
-        ai_score += 0.15
-        indicators.append("minimal pitch variation coefficient")
+    ('pitch_coefficient_of_variation', '<', 0.08, 0.15, "minimal pitch variation coefficient"),
+]
+
+# Column views of the rule table used by the vectorized classifier
+RULE_FEATURES = [rule[0] for rule in AI_VOICE_RULES]
+RULE_LESS_THAN = np.array([rule[1] == '<' for rule in AI_VOICE_RULES])
+RULE_INCLUSIVE = np.array([rule[1] == '>=' for rule in AI_VOICE_RULES])
+RULE_THRESHOLDS = np.array([rule[2] for rule in AI_VOICE_RULES], dtype=np.float64)
+# Thresholds as a float32 feature sees them (rounded to float32 under NEP 50)
+RULE_THRESHOLDS_FLOAT32 = RULE_THRESHOLDS.astype(np.float32).astype(np.float64)
+RULE_SCORES = np.array([rule[3] for rule in AI_VOICE_RULES], dtype=np.float64)
+RULE_INDICATORS = np.array([rule[4] for rule in AI_VOICE_RULES], dtype=object)
+RULE_HAS_STRICTER_TIER = np.array(
+    [i > 0 and AI_VOICE_RULES[i - 1][0] == rule[0] for i, rule in enumerate(AI_VOICE_RULES)]
+)
+
+
+def detect_ai_voice(features: dict, language: str) -> tuple[str, float, str]:
+    """
+    Detect if voice is AI-generated based on extracted features
+    
+    IMPROVED DETECTION: More sensitive to AI characteristics
+    
+    AI-generated voices typically have:
+    - Extremely consistent pitch (very low variability)
+    - Very uniform spectral characteristics
+    - Less natural breath sounds and micropauses
+    - More regular temporal patterns
+    - Smoother transitions (low jitter/shimmer)
+    - Lower MFCC variance in specific coefficients
+    - More consistent energy levels
+    """
+    
+    # Derived inputs; defaults cover features that may be absent
+    inputs = {'jitter': 0, 'shimmer': 0, 'mfcc_delta_std': 10.0, **features}
+    critical_mfcc_stds = np.array([features.get(f'mfcc_{i}_std', 10.0) for i in range(3, 15)])
+    inputs['low_variance_mfcc_count'] = int((critical_mfcc_stds < 3.0).sum())
+    inputs['abs_signal_kurtosis'] = abs(features['signal_kurtosis'])
+    
+    # Evaluate every rule at once, then keep only the strictest matching
+    # tier of each feature (tiers are monotone, so a tier counts when it
+    # hits and the stricter one above it does not)
+    # float32 features are compared against float32-rounded thresholds, as
+    # the scalar comparisons did; widening both sides to float64 is exact
+    raw_values = [inputs[key] for key in RULE_FEATURES]
+    values = np.array(raw_values, dtype=np.float64)
+    thresholds = np.where(
+        [isinstance(value, np.float32) for value in raw_values], RULE_THRESHOLDS_FLOAT32, RULE_THRESHOLDS
+    )
+    hits = np.where(
+        RULE_LESS_THAN,
+        values < thresholds,
+        np.where(RULE_INCLUSIVE, values >= thresholds, values > thresholds)
+    )
+    superseded = RULE_HAS_STRICTER_TIER & np.roll(hits, 1)
+    scoring = hits & ~superseded
+    
+    ai_score = float(RULE_SCORES[scoring].sum())
+    indicators = [name for name in RULE_INDICATORS[scoring] if name]
     
     # Normalize score to 0-1 range (but allow going over 1.0 initially)
     confidence_score = min(ai_score, 1.0)
@@ -326,6 +486,56 @@ def detect_ai_voice(features: dict, language: str) -> tuple[str, float, str]:
     
     return classification, round(confidence_score, 2), explanation
 
+def load_audio(audio_bytes: bytes) -> tuple[np.ndarray, int]:
+    """
+    Decode the analysis window of audio bytes into a mono, resampled signal
+    """
+    import librosa
+    import soundfile as sf
+    
+    # Decode audio straight to float32 with soundfile (this is what
+    # librosa.load does for in-memory files, minus its extra layers). Only
+    # the analysis window is decoded, so long uploads cost no more memory
+    # than a 15 second clip
+    try:
+        with sf.SoundFile(io.BytesIO(audio_bytes)) as audio_file:
+            sample_rate = audio_file.samplerate
+            audio_data = audio_file.read(
+                frames=sample_rate * MAX_AUDIO_SECONDS,
+                dtype='float32',
+                always_2d=False
+            )
+        if audio_data.ndim > 1:
+            audio_data = audio_data.mean(axis=1, dtype=np.float32)
+    except Exception as e:
+        logger.error(f"Error loading audio: {str(e)}")
+        raise AudioLoadError("Invalid audio file format")
+    
+    # Check if audio is valid
+    if len(audio_data) == 0:
+        raise AudioLoadError("Empty audio file")
+    
+    # Resample to the target rate
+    if sample_rate != TARGET_SAMPLE_RATE:
+        audio_data = librosa.resample(
+            audio_data,
+            orig_sr=sample_rate,
+            target_sr=TARGET_SAMPLE_RATE,
+            res_type='soxr_qq'  # Quick quality is plenty for statistical features
+        )
+        sample_rate = TARGET_SAMPLE_RATE
+    
+    return audio_data, sample_rate
+
+
+def analyse_audio(audio_bytes: bytes) -> dict:
+    """
+    Decode audio bytes and extract their features (runs in a worker process)
+    """
+    audio_data, sample_rate = load_audio(audio_bytes)
+    return extract_audio_features(audio_data, sample_rate)
+
+
 @app.get("/api/voice-detection")
 async def detect_voice_info():
     """
@@ -355,6 +565,75 @@ async def detect_voice_info():
         }
     }
     
+async def classify_voice(request: VoiceRequest) -> VoiceResponse:
+    """
+    Classify a single voice sample, raising HTTPException for invalid input
+    """
+    # Validate language
+    if request.language not in SUPPORTED_LANGUAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported language. Supported languages: {', '.join(SUPPORTED_LANGUAGES)}"
+        )
+    
+    # Bound each clip before decoding; the middleware only bounds the whole
+    # body, which for the batch endpoint holds many clips
+    if len(request.audioBase64) > MAX_BASE64_LENGTH:
+        raise HTTPException(status_code=413, detail="Payload too large")
+    
+    # Decode base64 audio
+    try:
+        audio_bytes = pybase64.b64decode(request.audioBase64, validate=False)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail="Invalid base64 encoding")
+    
+    # Reuse features for audio that was analysed recently
+    cache_key = xxhash.xxh3_64_digest(audio_bytes)
+    features = feature_cache.get(cache_key)
+    if features is not None:
+        feature_cache.move_to_end(cache_key)
+    else:
+        # Decode and extract features off the event loop
+        loop = asyncio.get_running_loop()
+        executor = get_feature_executor()
+        try:
+            features = await loop.run_in_executor(
+                executor, analyse_audio, audio_bytes
+            )
+        except AudioLoadError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except BrokenProcessPool:
+            # A worker died mid-analysis; rebuild the pool and let the client
+            # retry rather than replaying a payload that may have caused it
+            replace_broken_executor(executor)
+            raise HTTPException(
+                status_code=503,
+                detail="Audio analysis workers restarted, please retry"
+            )
+        
+        feature_cache[cache_key] = features
+        if len(feature_cache) > FEATURE_CACHE_SIZE:
+            feature_cache.popitem(last=False)
+    
+    # Detect AI voice
+    classification, confidence_score, explanation = detect_ai_voice(
+        features, request.language
+    )
+    
+    # Prepare response
+    response = VoiceResponse(
+        status="success",
+        language=request.language,
+        classification=classification,
+        confidenceScore=confidence_score,
+        explanation=explanation
+    )
+    
+    logger.info(f"Processed {request.language} audio: {classification} ({confidence_score})")
+    
+    return response
+
+
 @app.post("/api/voice-detection", response_model=VoiceResponse)
 async def detect_voice(
     request: VoiceRequest,
@@ -367,54 +646,52 @@ async def detect_voice(
         # Verify API key
         verify_api_key(x_api_key)
         
-        # Validate language
-        if request.language not in SUPPORTED_LANGUAGES:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported language. Supported languages: {', '.join(SUPPORTED_LANGUAGES)}"
-            )
+        return await classify_voice(request)
         
-        # Decode base64 audio
-        try:
-            audio_bytes = base64.b64decode(request.audioBase64)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail="Invalid base64 encoding")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.post("/api/voice-detection/batch", response_model=BatchResponse)
+async def detect_voice_batch(
+    request: BatchRequest,
+    x_api_key: str = Header(None, alias="x-api-key")
+):
+    """
+    Classify several voice samples in one request
+
+    Items are analysed in parallel on the worker pool; an invalid item gets
+    an error entry in its slot instead of failing the whole batch
+    """
+    try:
+        # Verify API key
+        verify_api_key(x_api_key)
         
-        # Load audio with librosa
-        try:
-            audio_data, sample_rate = librosa.load(
-                io.BytesIO(audio_bytes),
-                sr=None,  # Preserve original sample rate
-                mono=True
+        if len(request.items) > MAX_BATCH_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many items. Maximum batch size is {MAX_BATCH_ITEMS}"
             )
-        except Exception as e:
-            logger.error(f"Error loading audio: {str(e)}")
-            raise HTTPException(status_code=400, detail="Invalid audio file format")
         
-        # Check if audio is valid
-        if len(audio_data) == 0:
-            raise HTTPException(status_code=400, detail="Empty audio file")
-        
-        # Extract features
-        features = extract_audio_features(audio_data, sample_rate)
-        
-        # Detect AI voice
-        classification, confidence_score, explanation = detect_ai_voice(
-            features, request.language
+        outcomes = await asyncio.gather(
+            *(classify_voice(item) for item in request.items),
+            return_exceptions=True
         )
         
-        # Prepare response
-        response = VoiceResponse(
-            status="success",
-            language=request.language,
-            classification=classification,
-            confidenceScore=confidence_score,
-            explanation=explanation
-        )
+        results = []
+        for outcome in outcomes:
+            if isinstance(outcome, HTTPException):
+                results.append(ErrorResponse(status="error", message=outcome.detail))
+            elif isinstance(outcome, Exception):
+                logger.error(f"Unexpected error in batch item: {str(outcome)}")
+                results.append(ErrorResponse(status="error", message="Internal server error"))
+            else:
+                results.append(outcome)
         
-        logger.info(f"Processed {request.language} audio: {classification} ({confidence_score})")
-        
-        return response
+        return BatchResponse(status="success", results=results)
         
     except HTTPException:
         raise
@@ -456,4 +733,12 @@ if __name__ == "__main__":
     import uvicorn
     # Get port from environment variable (Railway uses PORT)
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=WEB_CONCURRENCY,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=MAX_CONCURRENT_REQUESTS
+    )